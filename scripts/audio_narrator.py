@@ -248,7 +248,7 @@ class AudioNarrator:
             elif self.project:
                 # Extract user from session_id (format: user_timestamp_hash)
                 user = session_id.split('_')[0] if '_' in session_id else 'unknown'
-                self.session_dir = Path(f"./{self.project}/recordings") / user / session_id
+                self.session_dir = Path(f"./recordings/{self.project}") / user / session_id
             else:
                 # Fallback to tmp directory
                 self.session_dir = Path(RECORDINGS_DIR) / session_id
@@ -6,6 +6,7 @@ import json
 import asyncio
 import logging
 import hashlib
+import re
 import time
 from datetime import datetime
 from pathlib import Path
@@ -40,6 +41,8 @@ RECORDINGS_DIR = "/tmp/recordings"  # Fallback only, project directories are pre
 BROWSER_VIEWPORT = {"width": 1920, "height": 1080}
 BROWSER_TIMEOUT = 30000  # 30 seconds
 BLOB_SIZE_THRESHOLD = 10240  # 10KB - store larger content as blobs
+# Cheap pre-filter for events.ndjson lines that HAR reconstruction needs
+HAR_EVENT_TYPE_RE = re.compile(rb'"type":\s*"(?:request|response)"')
 
 class Phase1BrowserRecorder:
     """Phase 1: PURE, LOSSLESS CAPTURE - No parsing, no truncation"""
@@ -62,8 +65,10 @@ class Phase1BrowserRecorder:
         self.event_counter = 0
         self.console_count = 0  # Track console messages for status display
         self.request_count = 0  # Track HTTP requests for status display
+        self.logged_counts = self._empty_logged_counts()  # Persisted to metadata.json
         self.session_id = None
         self.session_dir = None
+        self.description = None  # Saved in metadata.json for duplicate detection
         
         # Blob storage for large payloads
         self.blob_dir = None
@@ -87,11 +92,33 @@ class Phase1BrowserRecorder:
         elapsed = (time.time() - start_time) * 1000
         logger.info(f"Completed initialization in {elapsed:.2f}ms")
     
+    def _session_dir_for(self, user: str, session_id: str) -> Path:
+        """Session directory in the recordings/<project>/<user>/ layout RecordingManager reads"""
+        if self.project:
+            return Path(f"./recordings/{self.project}") / user / session_id
+        # Fallback to old structure if no project specified
+        return Path(RECORDINGS_DIR) / user / session_id
+    
     def _get_monotonic_id(self) -> str:
         """Generate monotonic event ID"""
         self.event_counter += 1
         return f"{self.session_id}-{self.event_counter:08d}"
     
+    @staticmethod
+    def _empty_logged_counts() -> Dict[str, int]:
+        """Per-category counts of events written to the NDJSON log"""
+        return {"events_count": 0, "requests_count": 0, "websockets_count": 0, "console_count": 0}
+    
+    def _count_logged_event(self, event_type: str):
+        """Classify a written event the same way RecordingManager counts events.ndjson"""
+        self.logged_counts["events_count"] += 1
+        if event_type.startswith('request'):
+            self.logged_counts["requests_count"] += 1
+        elif event_type.startswith('websocket'):
+            self.logged_counts["websockets_count"] += 1
+        elif event_type.startswith('console'):
+            self.logged_counts["console_count"] += 1
+    
     def _write_event(self, event_type: str, data: Dict[str, Any]):
         """Write event to NDJSON log"""
         # Skip if we're closing or no log file
@@ -110,6 +137,7 @@ class Phase1BrowserRecorder:
             # Write as single line JSON
             self.event_log_file.write(json.dumps(event) + '\n')
             self.event_log_file.flush()  # Ensure immediate write
+            self._count_logged_event(event_type)
             self.last_event_time = time.time()  # Track for health monitoring
             logger.debug(f"Wrote event {event['id']}: {event_type}")
         except Exception as e:
@@ -764,13 +792,10 @@ class Phase1BrowserRecorder:
             # Generate session ID
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             self.session_id = f"{user}_{timestamp}_{uuid.uuid4().hex[:8]}"
+            self.description = description
             
             # Create session directory with project structure
-            if self.project:
-                self.session_dir = Path(f"./{self.project}/recordings") / user / self.session_id
-            else:
-                # Fallback to old structure if no project specified
-                self.session_dir = Path(RECORDINGS_DIR) / user / self.session_id
+            self.session_dir = self._session_dir_for(user, self.session_id)
             self.session_dir.mkdir(parents=True, exist_ok=True)
             
             # Create blob directory
@@ -780,6 +805,7 @@ class Phase1BrowserRecorder:
             # Open NDJSON event log
             event_log_path = self.session_dir / "events.ndjson"
             self.event_log_file = open(event_log_path, 'w')
+            self.logged_counts = self._empty_logged_counts()
             
             logger.info(f"Session directory: {self.session_dir}")
             logger.info(f"Event log: {event_log_path}")
@@ -862,7 +888,8 @@ class Phase1BrowserRecorder:
             return {
                 "success": True,
                 "session_id": self.session_id,
-                "session_dir": str(self.session_dir)
+                "session_dir": str(self.session_dir),
+                "start_time": self.recording_start.isoformat()
             }
             
         except Exception as e:
@@ -953,6 +980,7 @@ class Phase1BrowserRecorder:
             # Write metadata summary
             metadata = {
                 "session_id": self.session_id,
+                "description": self.description,
                 "start_time": self.recording_start.isoformat(),
                 "end_time": recording_end.isoformat(),
                 "duration_seconds": duration,
@@ -961,7 +989,9 @@ class Phase1BrowserRecorder:
                 "cookie_timeline_length": len(self.cookie_timeline),
                 "har_file": "recording.har",
                 "event_log": "events.ndjson",
-                "blob_directory": "blobs/"
+                "blob_directory": "blobs/",
+                # Final event log counts, so listings don't re-scan events.ndjson
+                **self.logged_counts
             }
             
             metadata_path = self.session_dir / "metadata.json"
@@ -986,6 +1016,7 @@ class Phase1BrowserRecorder:
             self.websockets = {}
             self.cookie_timeline = []
             self.blob_hashes = set()
+            self.logged_counts = self._empty_logged_counts()
             
             elapsed = (time.time() - start_time) * 1000
             logger.info(f"PHASE 1 recording stopped successfully in {elapsed:.2f}ms")
@@ -1020,18 +1051,22 @@ class Phase1BrowserRecorder:
             # Read all request and response events
             requests = []
             responses = {}  # Map URL to response data
-            with open(events_file, 'r') as f:
+            with open(events_file, 'rb') as f:
                 for line in f:
+                    # Only request/response events are needed; skip parsing
+                    # snapshots, frames and other large events entirely
+                    if not HAR_EVENT_TYPE_RE.search(line):
+                        continue
                     try:
                         event = json.loads(line)
-                        if event.get('type') == 'request':
-                            requests.append(event)
-                        elif event.get('type') == 'response':
-                            # Store response by URL for matching
-                            url = event.get('data', {}).get('url', '')
-                            responses[url] = event.get('data', {})
-                    except json.JSONDecodeError:
+                    except ValueError:
                         continue
+                    if event.get('type') == 'request':
+                        requests.append(event)
+                    elif event.get('type') == 'response':
+                        # Store response by URL for matching
+                        url = event.get('data', {}).get('url', '')
+                        responses[url] = event.get('data', {})
 
             # Build HAR structure
             har = {
@@ -317,6 +317,7 @@ def record(project: str, user: Optional[str], audio: bool, description: Optional
                     console.print(f"  [yellow]Event log:[/yellow] events.ndjson (NDJSON format)")
                     console.print(f"  [yellow]HAR file:[/yellow] recording.har (with response bodies)")
                     console.print(f"  [yellow]Blobs:[/yellow] blobs/ directory (large payloads)")
+                    manager.register_recording(user, description, session_id, result.get("start_time"))
                 else:
                     console.print(f"[red]Failed to save recording: {stop_result.get('error')}[/red]")
             
@@ -426,7 +427,7 @@ def menu():
         elif project == "new":
             # Create new project
             project_name = Prompt.ask("Enter new project name")
-            Path(f"./{project_name}").mkdir(parents=True, exist_ok=True)
+            Path(f"./recordings/{project_name}").mkdir(parents=True, exist_ok=True)
             console.print(f"[green]Created new project: {project_name}[/green]")
             project = project_name
         
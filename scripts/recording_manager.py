@@ -1,32 +1,245 @@
 """Recording manager with project-based menu and coverage tracking"""
 
+import contextlib
+import heapq
 import json
 import logging
+import mmap
+import os
+import re
+import shutil
+import stat
+import sys
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Tuple
+import numpy as np
 from rich.console import Console
 from rich.table import Table
+from rich.text import Text
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich import box
 
-# Comprehensive logging
-from pathlib import Path
-Path('./logs').mkdir(parents=True, exist_ok=True)
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s.%(msecs)03d | %(levelname)s | %(funcName)s | %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S',
-    handlers=[
-        logging.FileHandler('./logs/recording_manager.log'),
-        logging.StreamHandler()
-    ]
-)
+try:
+    import orjson
+except ImportError:  # Optional speedup, installed with the "fast" extra
+    orjson = None
+
+# Logging is configured by the CLI entry point; this module only emits records
 logger = logging.getLogger(__name__)
 
+# Event counts written into metadata.json by the recorder at stop time
+EVENT_COUNT_KEYS = ("events_count", "requests_count", "websockets_count", "console_count")
+
+# One match per non-empty events.ndjson line: group 1 is the line's first
+# (top-level, the recorder writes it before "data") "type" value, group 2 is
+# a whole line that has no inline type and needs a real parse
+_EVENT_LINE_RE = re.compile(rb'^(?:[^\n]*?"type":[ \t]*"([^"\n]*)"|([^\n]+))', re.MULTILINE)
+
+# Per-project index of (user, description) pairs used by check_duplicate
+DEDUP_INDEX_FILE = ".dedup.json"
+
+# Project menu shows "999+" rather than walking very large projects
+RECORDING_COUNT_CAP = 999
+
+# Tables longer than this are drawn without row separator lines
+TABLE_LINES_MAX_ROWS = 50
+
+# Upper bound on threads used to load sessions in parallel
+SCAN_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# datetime.fromisoformat understands a trailing 'Z' from Python 3.11
+_ISO_PARSES_Z = sys.version_info >= (3, 11)
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def load_json_file(path: str) -> Any:
+    """Read a JSON file, using orjson when available"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def dumps_json(data: Any, indent: bool = True) -> bytes:
+    """Serialize data to JSON bytes, using orjson when available"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, default=str, option=option)
+    return json.dumps(data, indent=2 if indent else None, default=str).encode()
+
+
+def replace_json_file(path: str, data: Any):
+    """Atomically rewrite a JSON file via a temporary file and rename"""
+    # A unique temporary name per writer, so concurrent writers never share one
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        # mkstemp creates the file 0600; keep the permissions of the file being replaced
+        try:
+            os.fchmod(fd, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            os.fchmod(fd, 0o644)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(dumps_json(data))
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def count_session_dirs(project_dir: str, limit: int) -> int:
+    """Count session directories under a project's user directories, stopping at limit"""
+    count = 0
+    with os.scandir(project_dir) as users:
+        for user_entry in users:
+            if not user_entry.is_dir(follow_symlinks=False) or user_entry.name.startswith('.'):
+                continue
+            with os.scandir(user_entry.path) as sessions:
+                for session_entry in sessions:
+                    if session_entry.is_dir(follow_symlinks=False):
+                        count += 1
+                        if count >= limit:
+                            return count
+    return count
+
+
+def format_duration(duration: float) -> str:
+    """Format a duration in seconds as MM:SS"""
+    minutes = int(duration // 60)
+    seconds = int(duration % 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp, accepting a trailing 'Z' on every Python version"""
+    if not _ISO_PARSES_Z and value.endswith('Z'):
+        return datetime.fromisoformat(value[:-1]).replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(value)
+
+
+def session_timestamp(metadata: Dict[str, Any], fallback: float) -> float:
+    """Epoch seconds of a session's start_time, or the fallback if it is missing or invalid"""
+    start_time = metadata.get("start_time")
+    if isinstance(start_time, str) and start_time:
+        try:
+            return parse_timestamp(start_time).timestamp()
+        except (TypeError, ValueError):
+            pass
+    return fallback
+
+
+def empty_user_index() -> Dict[str, Any]:
+    """One user's entry in the duplicate index"""
+    return {"descriptions": {}, "sessions": []}
+
+
+def public_fields(rec: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the scanner's underscore-prefixed bookkeeping keys from a recording"""
+    return {key: value for key, value in rec.items() if not key.startswith('_')}
+
+
+def remove_trees(paths: List[str]):
+    """Delete directory trees, removing their top-level entries in parallel"""
+    entries = []
+    for path in paths:
+        with os.scandir(path) as it:
+            entries.extend((e.path, e.is_dir(follow_symlinks=False)) for e in it)
+    
+    def remove(entry: Tuple[str, bool]):
+        entry_path, is_dir = entry
+        if is_dir:
+            shutil.rmtree(entry_path)
+        else:
+            os.unlink(entry_path)
+    
+    # unlink/rmdir release the GIL, so sessions are removed concurrently
+    if entries:
+        with ThreadPoolExecutor(max_workers=min(SCAN_MAX_WORKERS, len(entries))) as executor:
+            list(executor.map(remove, entries))
+    
+    for path in paths:
+        os.rmdir(path)
+
+
+def stat_key(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def count_event_types(events_file: str) -> Dict[str, int]:
+    """Count events by category in an events.ndjson file without full JSON parsing"""
+    counts = dict.fromkeys(EVENT_COUNT_KEYS, 0)
+    
+    with open(events_file, 'rb') as ef:
+        if os.fstat(ef.fileno()).st_size == 0:
+            return counts
+        
+        # Scan the mapped file with the regex engine instead of iterating lines
+        with mmap.mmap(ef.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for match in _EVENT_LINE_RE.finditer(mm):
+                event_type = match.group(1)
+                if event_type is None:
+                    # Fall back to a real parse for lines without an inline type
+                    try:
+                        event_type = _json_loads(match.group(2)).get('type', '').encode()
+                    except (ValueError, AttributeError):
+                        continue
+                
+                counts['events_count'] += 1
+                if event_type.startswith(b'request'):
+                    counts['requests_count'] += 1
+                elif event_type.startswith(b'websocket'):
+                    counts['websockets_count'] += 1
+                elif event_type.startswith(b'console'):
+                    counts['console_count'] += 1
+    
+    return counts
+
+
+@dataclass
+class RecordingColumns:
+    """Column-oriented view of scanned recordings for vectorized aggregation"""
+    user_names: List[str]
+    user_ids: np.ndarray  # index into user_names, one per recording
+    durations: np.ndarray
+    events: np.ndarray
+    requests: np.ndarray
+    start_ts: np.ndarray  # NaN where a recording has no start time
+    descriptions: List[Optional[str]]
+    
+    @classmethod
+    def from_recordings(cls, recordings: Dict[str, List[Dict[str, Any]]]) -> "RecordingColumns":
+        """Build columns from the user -> recordings mapping returned by _scan_recordings"""
+        user_names = list(recordings)
+        flat = [(i, rec) for i, user in enumerate(user_names) for rec in recordings[user]]
+        
+        def column(key: str, dtype, default=0) -> np.ndarray:
+            return np.fromiter((rec.get(key, default) for _, rec in flat), dtype=dtype, count=len(flat))
+        
+        return cls(
+            user_names=user_names,
+            user_ids=np.fromiter((i for i, _ in flat), dtype=np.int32, count=len(flat)),
+            durations=column("duration_seconds", np.float64),
+            events=column("events_count", np.int64),
+            requests=column("requests_count", np.int64),
+            start_ts=column("_start_ts", np.float64, np.nan),
+            descriptions=[rec.get("description") for _, rec in flat],
+        )
+
+
 class RecordingManager:
     def __init__(self, project: Optional[str] = None):
         start_time = time.time()
@@ -43,6 +256,15 @@ class RecordingManager:
             # Base directory for project listing (recordings root)
             self.recordings_dir = Path("./recordings")
         
+        # Parsed session data keyed by session path; reused while the
+        # metadata.json / events.ndjson stat signature is unchanged
+        self._scan_cache: Dict[str, Tuple[Tuple[int, ...], Dict[str, Any]]] = {}
+        
+        # user -> {"descriptions": lowercased description -> recording info,
+        # "sessions": every session ID already indexed}, loaded on first use
+        self._dedup_path = self.recordings_dir / DEDUP_INDEX_FILE
+        self._dedup_index: Optional[Dict[str, Dict[str, Any]]] = None
+        
         elapsed = (time.time() - start_time) * 1000
         logger.info(f"Completed initialization in {elapsed:.2f}ms")
     
@@ -61,23 +283,21 @@ class RecordingManager:
         # Scan for existing projects
         projects = []
         recordings_base = Path("./recordings")
-        if recordings_base.exists():
-            for item in recordings_base.iterdir():
-                if item.is_dir() and not item.name.startswith('.'):
-                    projects.append(item.name)
+        if recordings_base.is_dir():
+            # scandir entries carry d_type, so is_dir() needs no extra stat
+            with os.scandir(recordings_base) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.'):
+                        projects.append(entry.name)
 
         if projects:
             self.console.print("\n[bold]Existing Projects:[/bold]")
             for i, project in enumerate(projects, 1):
-                # Get recording count
-                recordings_dir = Path(f"./recordings/{project}")
-                recording_count = 0
-                if recordings_dir.exists():
-                    for user_dir in recordings_dir.iterdir():
-                        if user_dir.is_dir():
-                            recording_count += len(list(user_dir.glob("*/metadata.json")))
+                # Get recording count, capped so huge projects don't stall the menu
+                recording_count = count_session_dirs(os.path.join("./recordings", project), RECORDING_COUNT_CAP + 1)
+                count_str = f"{RECORDING_COUNT_CAP}+" if recording_count > RECORDING_COUNT_CAP else str(recording_count)
                 
-                self.console.print(f"  [cyan]{i}[/cyan] - {project} ({recording_count} recordings)")
+                self.console.print(f"  [cyan]{i}[/cyan] - {project} ({count_str} recordings)")
         else:
             self.console.print("\n[yellow]No existing projects found.[/yellow]")
         
@@ -124,11 +344,25 @@ class RecordingManager:
             self.console.print("[dim]Start a recording with: ./run.sh record --project {self.project} --user USER --description 'Description'[/dim]")
             return
         
-        # Create table
+        rows = [
+            (
+                user,
+                rec.get("description", "No description"),
+                format_duration(rec.get("duration_seconds", 0)),
+                str(rec.get("events_count", 0)),
+                str(rec.get("requests_count", 0)),
+                str(rec.get("websockets_count", 0)),
+                str(rec.get("console_count", 0)),
+            )
+            for user, user_recordings in recordings.items()
+            for rec in user_recordings
+        ]
+        
+        # Create table; row separators get expensive to render on long listings
         table = Table(
             title=f"All Recordings in {self.project}",
             box=box.ROUNDED,
-            show_lines=True
+            show_lines=len(rows) <= TABLE_LINES_MAX_ROWS
         )
         
         table.add_column("User", style="cyan", no_wrap=True)
@@ -139,129 +373,188 @@ class RecordingManager:
         table.add_column("WebSockets", justify="center")
         table.add_column("Console", justify="center")
         
-        for user, user_recordings in recordings.items():
-            for rec in user_recordings:
-                # Format duration in MM:SS
-                duration = rec.get("duration_seconds", 0)
-                minutes = int(duration // 60)
-                seconds = int(duration % 60)
-                duration_str = f"{minutes}:{seconds:02d}"
-                
-                table.add_row(
-                    user,
-                    rec.get("description", "No description"),
-                    duration_str,
-                    str(rec.get("events_count", 0)),
-                    str(rec.get("requests_count", 0)),
-                    str(rec.get("websockets_count", 0)),
-                    str(rec.get("console_count", 0))
-                )
+        for row in rows:
+            table.add_row(*row)
         
         self.console.print("\n")
         self.console.print(table)
     
     def _scan_recordings(self) -> Dict[str, List[Dict[str, Any]]]:
         """Scan directory for existing recordings in project structure"""
-        logger.info(f"Scanning recordings in {self.recordings_dir}")
+        logger.info("Scanning recordings in %s", self.recordings_dir)
         
         recordings = {}
         
-        if not self.recordings_dir.exists():
+        if not self.recordings_dir.is_dir():
             return recordings
         
         try:
-            # Project structure: project/recordings/user/session/
-            for user_dir in self.recordings_dir.iterdir():
-                if user_dir.is_dir() and not user_dir.name.startswith('.'):
-                    user = user_dir.name
-                    recordings[user] = []
-                    
-                    for session_dir in user_dir.iterdir():
-                        if session_dir.is_dir():
-                            metadata_file = session_dir / "metadata.json"
-                            if metadata_file.exists():
-                                try:
-                                    with open(metadata_file, 'r') as f:
-                                        metadata = json.load(f)
-                                        
-                                        # Add metrics from events.ndjson if available
-                                        events_file = session_dir / "events.ndjson"
-                                        if events_file.exists():
-                                            events_count = 0
-                                            requests_count = 0
-                                            websockets_count = 0
-                                            console_count = 0
-                                            
-                                            with open(events_file, 'r') as ef:
-                                                for line in ef:
-                                                    try:
-                                                        event = json.loads(line)
-                                                        events_count += 1
-                                                        event_type = event.get('type', '')
-                                                        if event_type.startswith('request'):
-                                                            requests_count += 1
-                                                        elif event_type.startswith('websocket'):
-                                                            websockets_count += 1
-                                                        elif event_type == 'console':
-                                                            console_count += 1
-                                                    except:
-                                                        pass
-                                            
-                                            metadata['events_count'] = events_count
-                                            metadata['requests_count'] = requests_count
-                                            metadata['websockets_count'] = websockets_count
-                                            metadata['console_count'] = console_count
-                                        
-                                        recordings[user].append({
-                                            "session_id": session_dir.name,
-                                            "path": str(session_dir),
-                                            **metadata
-                                        })
-                                except Exception as e:
-                                    logger.warning(f"Failed to read {metadata_file}: {e}")
-                                    continue
+            session_paths = []
+            for user, user_sessions in self._list_sessions().items():
+                recordings[user] = []
+                session_paths.extend((user, session_id, path) for session_id, path in user_sessions)
+            
+            # Cache hits cost one stat, so they are answered here; only misses
+            # are worth handing to worker threads
+            loaded = [None] * len(session_paths)
+            misses = []
+            for i, (_, _, path) in enumerate(session_paths):
+                meta_stat, session = self._cached_session(path)
+                if session is not None:
+                    loaded[i] = session
+                elif meta_stat is not None:
+                    misses.append((i, path, meta_stat))
+            
+            # Session reads are dominated by open/read, which release the GIL
+            if len(misses) == 1:
+                i, path, meta_stat = misses[0]
+                loaded[i] = self._read_session(path, meta_stat)
+            elif misses:
+                with ThreadPoolExecutor(max_workers=min(SCAN_MAX_WORKERS, len(misses))) as executor:
+                    sessions = executor.map(lambda miss: self._read_session(*miss[1:]), misses)
+                    for (i, _, _), session in zip(misses, sessions):
+                        loaded[i] = session
+            
+            for (user, session_id, _), session in zip(session_paths, loaded):
+                if session is not None:
+                    recordings[user].append({"session_id": session_id, **session})
+            
+            # Drop cache entries for sessions that no longer exist
+            seen = {rec["path"] for recs in recordings.values() for rec in recs}
+            for stale in self._scan_cache.keys() - seen:
+                del self._scan_cache[stale]
             
             total = sum(len(v) for v in recordings.values())
-            logger.info(f"Found {total} recordings across {len(recordings)} users")
+            logger.info("Found %d recordings across %d users", total, len(recordings))
             
         except Exception as e:
             logger.error(f"Error scanning recordings: {e}")
         
         return recordings
     
-    def _calculate_coverage(self, recordings: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Calculate coverage statistics for a user"""
-        logger.debug(f"Calculating coverage for {len(recordings)} recordings")
-        
-        coverage = {
-            "total_recordings": len(recordings),
-            "total_duration": 0,
-            "total_events": 0,
-            "total_requests": 0,
-            "unique_urls": set(),
-            "features_covered": set(),
-            "last_recording": None
-        }
+    def _list_sessions(self) -> Dict[str, List[Tuple[str, str]]]:
+        """Map each user to the (session_id, path) pairs of their session directories"""
+        # Project structure: recordings/project/user/session/
+        # os.scandir exposes d_type via DirEntry, avoiding a stat() per entry
+        with os.scandir(self.recordings_dir) as users:
+            user_entries = [
+                e for e in users
+                if e.is_dir(follow_symlinks=False) and not e.name.startswith('.')
+            ]
         
-        for rec in recordings:
-            coverage["total_duration"] += rec.get("duration_seconds", 0)
-            coverage["total_events"] += rec.get("events_count", 0)
-            coverage["total_requests"] += rec.get("requests_count", 0)
-            
-            # Extract features from description
-            if "description" in rec:
-                coverage["features_covered"].add(rec["description"])
+        sessions = {}
+        for user_entry in user_entries:
+            with os.scandir(user_entry.path) as entries:
+                sessions[user_entry.name] = [(e.name, e.path) for e in entries if e.is_dir(follow_symlinks=False)]
+        return sessions
+    
+    def _load_session(self, session_path: str, cache: bool = True) -> Optional[Dict[str, Any]]:
+        """Load metadata and event counts for one session, using the scan cache when unchanged"""
+        meta_stat, session = self._cached_session(session_path)
+        if meta_stat is None or session is not None:
+            return session
+        return self._read_session(session_path, meta_stat, cache)
+    
+    def _cached_session(self, session_path: str) -> Tuple[Optional[os.stat_result], Optional[Dict[str, Any]]]:
+        """(metadata.json stat, cached session if still current); the stat is None when metadata.json is missing"""
+        try:
+            meta_stat = os.stat(os.path.join(session_path, "metadata.json"))
+        except FileNotFoundError:
+            return None, None
+        
+        # Signatures only include events.ndjson when the counts came from it,
+        # so finalized sessions cost one stat and no extra open on a cache hit
+        cached = self._scan_cache.get(session_path)
+        if cached:
+            signature, session = cached
+            if signature[:2] == (meta_stat.st_mtime_ns, meta_stat.st_size) and (
+                len(signature) == 2 or signature[2:] == stat_key(os.path.join(session_path, "events.ndjson"))
+            ):
+                return meta_stat, dict(session)
+        return meta_stat, None
+    
+    def _read_session(
+        self, session_path: str, meta_stat: os.stat_result, cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """Parse one session's metadata, counting legacy events.ndjson files, and cache the result"""
+        metadata_file = os.path.join(session_path, "metadata.json")
+        events_file = os.path.join(session_path, "events.ndjson")
+        meta_key = (meta_stat.st_mtime_ns, meta_stat.st_size)
+        # Taken before any count write-back, which would make the session look new
+        meta_mtime = meta_stat.st_mtime
+        
+        try:
+            metadata = load_json_file(metadata_file)
+            signature = meta_key
             
-            # Track last recording time
-            if rec.get("start_time"):
-                if not coverage["last_recording"] or rec["start_time"] > coverage["last_recording"]:
-                    coverage["last_recording"] = rec["start_time"]
+            # Sessions recorded after counts were persisted carry them in
+            # metadata.json; only legacy sessions need events.ndjson scanned
+            if not all(key in metadata for key in EVENT_COUNT_KEYS):
+                events_key = stat_key(events_file)
+                if events_key is not None:
+                    metadata.update(count_event_types(events_file))
+                    
+                    if self._persist_event_counts(metadata_file, metadata, meta_stat):
+                        meta_stat = os.stat(metadata_file)
+                        signature = (meta_stat.st_mtime_ns, meta_stat.st_size)
+                    else:
+                        signature = meta_key + events_key
+        except Exception as e:
+            logger.warning(f"Failed to read {metadata_file}: {e}")
+            return None
+        
+        session = {"path": session_path, **metadata, "_start_ts": session_timestamp(metadata, meta_mtime)}
+        if cache:
+            self._scan_cache[session_path] = (signature, session)
+        return dict(session)
+    
+    def _persist_event_counts(self, metadata_file: str, metadata: Dict[str, Any], meta_stat: os.stat_result) -> bool:
+        """Write scanned event counts back into a legacy session's metadata.json"""
+        try:
+            replace_json_file(metadata_file, metadata)
+            # Keep the original mtime: it stands in for start_time when that is missing
+            os.utime(metadata_file, ns=(meta_stat.st_atime_ns, meta_stat.st_mtime_ns))
+            logger.debug("Persisted event counts to %s", metadata_file)
+            return True
+        except OSError as e:
+            logger.debug("Could not persist event counts to %s: %s", metadata_file, e)
+            return False
+    
+    def _calculate_coverage(self, columns: "RecordingColumns") -> List[Dict[str, Any]]:
+        """Calculate coverage statistics for every user, indexed like columns.user_names"""
+        n_users = len(columns.user_names)
+        logger.debug("Calculating coverage for %d recordings", len(columns.user_ids))
+        
+        # One grouped reduction per column over the project-wide arrays
+        recordings = np.bincount(columns.user_ids, minlength=n_users)
+        durations = np.bincount(columns.user_ids, weights=columns.durations, minlength=n_users)
+        events = np.bincount(columns.user_ids, weights=columns.events, minlength=n_users)
+        requests = np.bincount(columns.user_ids, weights=columns.requests, minlength=n_users)
+        
+        # fmax ignores NaN, so users without any start time stay NaN
+        last_start = np.full(n_users, np.nan)
+        np.fmax.at(last_start, columns.user_ids, columns.start_ts)
         
-        # Convert sets to lists for display
-        coverage["unique_urls"] = len(coverage["unique_urls"])
-        coverage["features_covered"] = list(coverage["features_covered"])
+        # Extract features from description, in first-seen order
+        features = [{} for _ in range(n_users)]
+        for user_id, description in zip(columns.user_ids.tolist(), columns.descriptions):
+            if description is not None:
+                features[user_id][description] = None
+        
+        coverage = [
+            {
+                "total_recordings": int(recordings[user_id]),
+                "total_duration": float(durations[user_id]),
+                "total_events": int(events[user_id]),
+                "total_requests": int(requests[user_id]),
+                "unique_urls": 0,
+                "features_covered": list(features[user_id]),
+                "last_recording": None if np.isnan(last_start[user_id]) else float(last_start[user_id]),
+            }
+            for user_id in range(n_users)
+        ]
         
-        logger.debug(f"Coverage: {coverage['total_recordings']} recordings, {coverage['total_events']} events")
+        logger.debug("Coverage: %d users, %d events", n_users, int(events.sum()))
         
         return coverage
     
@@ -284,28 +577,9 @@ class RecordingManager:
         if not recordings:
             self.console.print("\n[yellow]No recordings found yet![/yellow]\n")
         else:
-            # Create coverage table
-            table = Table(
-                title="Recording Coverage by User",
-                box=box.ROUNDED,
-                show_lines=True
-            )
-            
-            table.add_column("User", style="cyan", no_wrap=True)
-            table.add_column("Recordings", justify="center")
-            table.add_column("Total Duration", justify="center")
-            table.add_column("Total Events", justify="center")
-            table.add_column("Features", justify="left")
-            table.add_column("Last Recording", style="dim")
-            
-            for user, user_recordings in recordings.items():
-                coverage = self._calculate_coverage(user_recordings)
-                
-                # Format duration in MM:SS
-                duration = coverage["total_duration"]
-                minutes = int(duration // 60)
-                seconds = int(duration % 60)
-                duration_str = f"{minutes}:{seconds:02d}"
+            rows = []
+            columns = RecordingColumns.from_recordings(recordings)
+            for user, coverage in zip(columns.user_names, self._calculate_coverage(columns)):
                 
                 # Format features
                 features = coverage["features_covered"][:3]  # Show first 3
@@ -315,29 +589,45 @@ class RecordingManager:
                 
                 # Format last recording
                 last_rec = coverage["last_recording"]
-                if last_rec:
-                    last_dt = datetime.fromisoformat(last_rec.replace('Z', '+00:00'))
-                    last_str = last_dt.strftime("%Y-%m-%d %H:%M")
+                if last_rec is not None:
+                    last_str = datetime.fromtimestamp(last_rec).strftime("%Y-%m-%d %H:%M")
                 else:
                     last_str = "Never"
                 
                 # Color code based on coverage
                 rec_count = coverage["total_recordings"]
                 if rec_count >= 10:
-                    count_style = "[green]"
+                    count_style = "green"
                 elif rec_count >= 5:
-                    count_style = "[yellow]"
+                    count_style = "yellow"
                 else:
-                    count_style = "[red]"
+                    count_style = "red"
                 
-                table.add_row(
+                rows.append((
                     user,
-                    f"{count_style}{rec_count}[/]",
-                    duration_str,
+                    Text(str(rec_count), style=count_style),
+                    format_duration(coverage["total_duration"]),
                     str(coverage["total_events"]),
                     features_str,
                     last_str
-                )
+                ))
+            
+            # Create coverage table
+            table = Table(
+                title="Recording Coverage by User",
+                box=box.ROUNDED,
+                show_lines=len(rows) <= TABLE_LINES_MAX_ROWS
+            )
+            
+            table.add_column("User", style="cyan", no_wrap=True)
+            table.add_column("Recordings", justify="center")
+            table.add_column("Total Duration", justify="center")
+            table.add_column("Total Events", justify="center")
+            table.add_column("Features", justify="left")
+            table.add_column("Last Recording", style="dim")
+            
+            for row in rows:
+                table.add_row(*row)
             
             self.console.print("\n")
             self.console.print(table)
@@ -353,10 +643,9 @@ class RecordingManager:
                     rec["user"] = user
                     all_recordings.append(rec)
             
-            all_recordings.sort(key=lambda x: x.get("start_time", ""), reverse=True)
-            recent = all_recordings[:5]
+            recent = heapq.nlargest(5, all_recordings, key=lambda x: x.get("_start_ts", 0))
             
-            recent_table = Table(box=box.SIMPLE)
+            recent_table = Table(box=box.MINIMAL, show_edge=False)
             recent_table.add_column("Time", style="dim")
             recent_table.add_column("User", style="cyan")
             recent_table.add_column("Description")
@@ -364,19 +653,11 @@ class RecordingManager:
             recent_table.add_column("Events", justify="right")
             
             for rec in recent:
-                start_time = datetime.fromisoformat(rec["start_time"].replace('Z', '+00:00'))
-                time_str = start_time.strftime("%H:%M")
-                
-                duration = rec.get("duration_seconds", 0)
-                minutes = int(duration // 60)
-                seconds = int(duration % 60)
-                duration_str = f"{minutes}:{seconds:02d}"
-                
                 recent_table.add_row(
-                    time_str,
+                    datetime.fromtimestamp(rec["_start_ts"]).strftime("%H:%M"),
                     rec["user"],
                     rec.get("description", "No description"),
-                    duration_str,
+                    format_duration(rec.get("duration_seconds", 0)),
                     str(rec.get("events_count", 0))
                 )
             
@@ -400,42 +681,174 @@ class RecordingManager:
         """Check if similar recording already exists (user + description must be unique within project)"""
         logger.info(f"Checking for duplicate: user={user}, description={description} in project={self.project}")
         
-        recordings = self._scan_recordings()
+        rec = self._sync_user_index(user).get(description.lower())
         
-        if user in recordings:
-            for rec in recordings[user]:
-                if rec.get("description", "").lower() == description.lower():
-                    logger.warning(f"Found duplicate recording: {rec['session_id']}")
-                    
-                    # Show warning
-                    self.console.print(f"\n[yellow]⚠ Warning: Duplicate recording found![/yellow]")
-                    self.console.print(f"  Project: {self.project}")
-                    self.console.print(f"  User: {user}")
-                    self.console.print(f"  Description: {description}")
-                    self.console.print(f"  Recorded: {rec.get('start_time', 'Unknown')}")
-                    
-                    # Ask user to confirm
-                    proceed = Confirm.ask("\nDo you want to create another recording anyway?")
-                    return not proceed  # Return True if duplicate and user doesn't want to proceed
+        if rec:
+            logger.warning(f"Found duplicate recording: {rec['session_id']}")
+            
+            # Show warning
+            self.console.print(f"\n[yellow]⚠ Warning: Duplicate recording found![/yellow]")
+            self.console.print(f"  Project: {self.project}")
+            self.console.print(f"  User: {user}")
+            self.console.print(f"  Description: {description}")
+            self.console.print(f"  Recorded: {rec.get('start_time') or 'Unknown'}")
+            
+            # Ask user to confirm
+            proceed = Confirm.ask("\nDo you want to create another recording anyway?")
+            return not proceed  # Return True if duplicate and user doesn't want to proceed
         
         return False
     
+    def register_recording(self, user: str, description: str, session_id: str, start_time: Optional[str] = None):
+        """Add a completed recording to the duplicate index"""
+        # Re-read first: the recording may have run for a long time, and other
+        # processes may have updated the index since check_duplicate loaded it
+        self._dedup_index = None
+        user_index = self._get_dedup_index().setdefault(user, empty_user_index())
+        user_index["descriptions"][description.lower()] = {"session_id": session_id, "start_time": start_time}
+        if session_id not in user_index["sessions"]:
+            user_index["sessions"].append(session_id)
+        self._save_dedup_index()
+    
+    def _sync_user_index(self, user: str) -> Dict[str, Dict[str, Any]]:
+        """Reconcile one user's duplicate index with the session directories on disk"""
+        user_index = self._get_dedup_index().get(user) or empty_user_index()
+        try:
+            with os.scandir(self.recordings_dir / user) as sessions:
+                on_disk = {e.name: e.path for e in sessions if e.is_dir(follow_symlinks=False)}
+        except FileNotFoundError:
+            on_disk = {}
+        
+        # Every session already looked at is listed, including ones without a
+        # description or whose description a newer session took over
+        seen = set(user_index["sessions"])
+        removed = seen - on_disk.keys()
+        
+        # Sessions recorded without going through register_recording; ones
+        # whose metadata.json is not written yet are retried on the next check
+        added = []
+        found = {}
+        for session_id in on_disk.keys() - seen:
+            session = self._load_session(on_disk[session_id])
+            if session is None:
+                continue
+            added.append(session_id)
+            if isinstance(session.get("description"), str):
+                found.setdefault(session["description"].lower(), {
+                    "session_id": session_id,
+                    "start_time": session.get("start_time"),
+                })
+        
+        if not removed and not added:
+            return user_index["descriptions"]
+        
+        # Merge into a fresh read so concurrent updates to the index are kept
+        self._dedup_index = None
+        index = self._get_dedup_index()
+        user_index = index.get(user) or empty_user_index()
+        before = json.dumps(user_index, sort_keys=True)
+        
+        sessions = [sid for sid in user_index["sessions"] if sid not in removed]
+        sessions.extend(sid for sid in added if sid not in sessions)
+        descriptions = {
+            desc: rec for desc, rec in user_index["descriptions"].items() if rec["session_id"] not in removed
+        }
+        for desc, rec in found.items():
+            if descriptions.get(desc, {}).get("session_id") not in on_disk:
+                descriptions[desc] = rec
+        user_index = {"descriptions": descriptions, "sessions": sessions}
+        
+        if json.dumps(user_index, sort_keys=True) != before:
+            if sessions:
+                index[user] = user_index
+            else:
+                index.pop(user, None)
+            self._save_dedup_index()
+        return descriptions
+    
+    def _get_dedup_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the duplicate index, rebuilding it from a scan if the file is missing or malformed"""
+        if self._dedup_index is not None:
+            return self._dedup_index
+        
+        try:
+            index = load_json_file(str(self._dedup_path))
+            if isinstance(index, dict) and all(
+                isinstance(v, dict) and isinstance(v.get("descriptions"), dict) and isinstance(v.get("sessions"), list)
+                for v in index.values()
+            ):
+                self._dedup_index = index
+                return self._dedup_index
+            logger.warning(f"Rebuilding malformed duplicate index {self._dedup_path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Rebuilding unreadable duplicate index {self._dedup_path}: {e}")
+        
+        self._dedup_index = {}
+        for user, user_recs in self._scan_recordings().items():
+            user_index = self._dedup_index[user] = empty_user_index()
+            for rec in user_recs:
+                user_index["sessions"].append(rec["session_id"])
+                if isinstance(rec.get("description"), str):
+                    user_index["descriptions"][rec["description"].lower()] = {
+                        "session_id": rec["session_id"],
+                        "start_time": rec.get("start_time"),
+                    }
+        self._save_dedup_index()
+        return self._dedup_index
+    
+    def _save_dedup_index(self):
+        """Persist the duplicate index next to the project's recordings"""
+        if self._dedup_index is None or not self.recordings_dir.is_dir():
+            return
+        try:
+            replace_json_file(str(self._dedup_path), self._dedup_index)
+        except OSError as e:
+            logger.warning(f"Failed to save duplicate index {self._dedup_path}: {e}")
+    
+    def _find_session(self, session_id: str) -> Optional[Tuple[str, str]]:
+        """Locate a session directory by exact or partial ID, returning (user, path)"""
+        if not self.recordings_dir.is_dir():
+            return None
+        
+        with os.scandir(self.recordings_dir) as users:
+            user_entries = [
+                e for e in users
+                if e.is_dir(follow_symlinks=False) and not e.name.startswith('.')
+            ]
+        
+        # Exact IDs resolve with one stat per user directory
+        for user_entry in user_entries:
+            session_path = os.path.join(user_entry.path, session_id)
+            if os.path.isfile(os.path.join(session_path, "metadata.json")):
+                return user_entry.name, session_path
+        
+        # Partial IDs only need directory names, not file contents
+        for user_entry in user_entries:
+            with os.scandir(user_entry.path) as sessions:
+                for entry in sessions:
+                    if (
+                        session_id in entry.name
+                        and entry.is_dir(follow_symlinks=False)
+                        and os.path.isfile(os.path.join(entry.path, "metadata.json"))
+                    ):
+                        return user_entry.name, entry.path
+        
+        return None
+    
     def view_recording_details(self, session_id: str):
         """Display detailed information about a recording"""
         logger.info(f"Viewing details for session: {session_id}")
         
-        # Find the recording
-        recordings = self._scan_recordings()
+        # Find the recording by directory name, loading only the match
         found = None
-        
-        for user, user_recs in recordings.items():
-            for rec in user_recs:
-                if session_id in rec.get("session_id", ""):
-                    found = rec
-                    found["user"] = user
-                    break
-            if found:
-                break
+        match = self._find_session(session_id)
+        if match:
+            user, session_path = match
+            session = self._load_session(session_path)
+            if session is not None:
+                found = {"session_id": os.path.basename(session_path), **session, "user": user}
         
         if not found:
             self.console.print(f"[red]Recording {session_id} not found![/red]")
@@ -456,12 +869,7 @@ class RecordingManager:
         details_table.add_row("Description", found.get("description", "No description"))
         details_table.add_row("Start Time", found.get("start_time", "Unknown"))
         
-        # Format duration in MM:SS
-        duration = found.get("duration_seconds", 0)
-        minutes = int(duration // 60)
-        seconds = int(duration % 60)
-        duration_str = f"{minutes}:{seconds:02d}"
-        details_table.add_row("Duration", duration_str)
+        details_table.add_row("Duration", format_duration(found.get("duration_seconds", 0)))
         
         details_table.add_row("Total Events", str(found.get("events_count", 0)))
         details_table.add_row("HTTP Requests", str(found.get("requests_count", 0)))
@@ -480,11 +888,33 @@ class RecordingManager:
                 border_style="dim"
             ))
     
+    def _count_recordings(self, user: Optional[str] = None) -> Dict[str, int]:
+        """Count recordings per user from the directory layout, without reading any files"""
+        counts = {}
+        
+        if not self.recordings_dir.is_dir():
+            return counts
+        
+        with os.scandir(self.recordings_dir) as users:
+            user_entries = [
+                e for e in users
+                if e.is_dir(follow_symlinks=False) and not e.name.startswith('.') and (not user or e.name == user)
+            ]
+        
+        for user_entry in user_entries:
+            with os.scandir(user_entry.path) as sessions:
+                counts[user_entry.name] = sum(
+                    1 for e in sessions
+                    if e.is_dir(follow_symlinks=False) and os.path.isfile(os.path.join(e.path, "metadata.json"))
+                )
+        
+        return counts
+    
     def delete_recordings(self, user: Optional[str] = None):
         """Delete recordings for a user or all"""
         logger.info(f"Deleting recordings for user: {user or 'ALL'} in project: {self.project}")
         
-        recordings = self._scan_recordings()
+        recordings = self._count_recordings(user)
         
         if user and user not in recordings:
             self.console.print(f"[red]No recordings found for user: {user}[/red]")
@@ -492,10 +922,10 @@ class RecordingManager:
         
         # Confirm deletion
         if user:
-            count = len(recordings[user])
+            count = recordings[user]
             confirm_msg = f"Delete {count} recording(s) for user '{user}' in project '{self.project}'?"
         else:
-            count = sum(len(v) for v in recordings.values())
+            count = sum(recordings.values())
             confirm_msg = f"Delete ALL {count} recording(s) in project '{self.project}'?"
         
         if not Confirm.ask(f"[red]{confirm_msg}[/red]"):
@@ -504,18 +934,24 @@ class RecordingManager:
         
         # Perform deletion
         try:
-            import shutil
-            
             if user:
                 user_dir = self.recordings_dir / user
                 if user_dir.exists():
-                    shutil.rmtree(user_dir)
+                    remove_trees([str(user_dir)])
+                    self._dedup_index = None
+                    self._get_dedup_index().pop(user, None)
+                    self._save_dedup_index()
                     logger.info(f"Deleted recordings for user: {user}")
                     self.console.print(f"[green]Deleted {count} recording(s) for user '{user}'[/green]")
             else:
-                for user_dir in self.recordings_dir.iterdir():
-                    if user_dir.is_dir() and not user_dir.name.startswith('.'):
-                        shutil.rmtree(user_dir)
+                with os.scandir(self.recordings_dir) as users:
+                    user_dirs = [
+                        e.path for e in users
+                        if e.is_dir(follow_symlinks=False) and not e.name.startswith('.')
+                    ]
+                remove_trees(user_dirs)
+                self._dedup_index = {}
+                self._save_dedup_index()
                 logger.info("Deleted all recordings")
                 self.console.print(f"[green]Deleted all {count} recording(s)[/green]")
                 
@@ -530,26 +966,60 @@ class RecordingManager:
         if not output_path:
             output_path = f"{self.project}_recordings_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
-        recordings = self._scan_recordings()
+        try:
+            sessions = self._list_sessions() if self.recordings_dir.is_dir() else {}
+        except OSError as e:
+            logger.error(f"Error scanning recordings: {e}")
+            sessions = {}
         
-        if not recordings:
+        if not sessions:
             self.console.print("[yellow]No recordings to export![/yellow]")
             return
         
         try:
-            export_data = {
-                "project": self.project,
-                "export_time": datetime.now().isoformat(),
-                "recordings": recordings
-            }
-            
-            with open(output_path, 'w') as f:
-                json.dump(export_data, f, indent=2, default=str)
+            total = self._write_export(output_path, sessions)
             
-            total = sum(len(v) for v in recordings.values())
             logger.info(f"Exported {total} recordings to {output_path}")
             self.console.print(f"[green]Exported {total} recording(s) to {output_path}[/green]")
             
         except Exception as e:
             logger.error(f"Failed to export recordings: {e}")
-            self.console.print(f"[red]Error exporting recordings: {e}[/red]")
\ No newline at end of file
+            self.console.print(f"[red]Error exporting recordings: {e}[/red]")
+    
+    def _write_export(self, output_path: str, sessions: Dict[str, List[Tuple[str, str]]]) -> int:
+        """Write the export loading one session at a time, so only that session is held in memory"""
+        export_time = datetime.now().isoformat()
+        total = 0
+        
+        def loaded(user_sessions: List[Tuple[str, str]]):
+            # Bypass the scan cache, which would otherwise keep every session alive
+            for session_id, path in user_sessions:
+                session = self._load_session(path, cache=False)
+                if session is not None:
+                    yield public_fields({"session_id": session_id, **session})
+        
+        with open(output_path, 'wb') as f:
+            if output_path.endswith('.ndjson'):
+                # One self-contained line per recording
+                for user, user_sessions in sessions.items():
+                    for rec in loaded(user_sessions):
+                        line = {"project": self.project, "export_time": export_time, "user": user, "session": rec}
+                        f.write(dumps_json(line, indent=False) + b"\n")
+                        total += 1
+                return total
+            
+            # Same layout as a single indented {"project", "export_time", "recordings"} document
+            f.write(b'{\n  "project": ' + dumps_json(self.project))
+            f.write(b',\n  "export_time": ' + dumps_json(export_time))
+            f.write(b',\n  "recordings": {')
+            for i, (user, user_sessions) in enumerate(sessions.items()):
+                f.write((b',' if i else b'') + b'\n    ' + dumps_json(user) + b': [')
+                count = 0
+                for rec in loaded(user_sessions):
+                    body = dumps_json(rec).replace(b'\n', b'\n      ')
+                    f.write((b',' if count else b'') + b'\n      ' + body)
+                    count += 1
+                f.write(b'\n    ]' if count else b']')
+                total += count
+            f.write(b'\n  }\n}')
+        return total
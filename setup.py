@@ -41,6 +41,9 @@ setup(
         "python-dotenv>=1.0.0",
         "requests>=2.31.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.9.0"],
+    },
     entry_points={
         "console_scripts": [
             "apitool=scripts.cli:cli",
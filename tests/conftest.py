@@ -0,0 +1,28 @@
+"""Shared pytest fixtures"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def config_module():
+    """scripts.config, imported once per test session"""
+    import scripts.config as config
+    return config
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _verify_base_dirs(config_module):
+    """scripts.config creates its base directories on import"""
+    assert config_module.LOGS_DIR.exists()
+    assert config_module.RECORDINGS_DIR.exists()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def recordings_root(config_module, tmp_path_factory):
+    """Redirect get_recording_dir() into a per-session temporary directory"""
+    # Not created here: get_recording_dir() makes it on first use, so runs
+    # that never ask for a recording directory never touch the disk for it
+    root = tmp_path_factory.getbasetemp() / "recordings"
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(config_module, "RECORDING_OUTPUT_DIR", root)
+        yield root
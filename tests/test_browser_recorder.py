@@ -0,0 +1,54 @@
+"""Tests for browser recorder event logging"""
+
+import json
+from scripts.browser_recorder import Phase1BrowserRecorder
+from scripts.recording_manager import count_event_types
+
+
+class TestBrowserRecorder:
+    """Test event counting and HAR reconstruction from events.ndjson"""
+
+    def setup_method(self):
+        """Setup a recorder writing to a session directory without a browser"""
+        self.recorder = Phase1BrowserRecorder(project="test_project")
+        self.recorder.session_id = "alice_s1"
+
+    def write_events(self, session_dir):
+        """Write a mix of events through the recorder's NDJSON logger"""
+        self.recorder.session_dir = session_dir
+        self.recorder.event_log_file = open(session_dir / "events.ndjson", "w")
+        url = "https://example.test/api/login"
+        self.recorder._write_event("request", {"url": url, "method": "POST", "headers": {"accept": "*/*"},
+                                               "post_data": "user=alice"})
+        # Nested "type" values must not be mistaken for the event's own type
+        self.recorder._write_event("snapshot", {"html": "<div></div>", "meta": {"type": "response"}})
+        self.recorder._write_event("console_message", {"type": "log", "text": "type: request"})
+        self.recorder._write_event("response", {"url": url, "status": 201, "status_text": "Created",
+                                                "headers": {"content-type": "application/json"}})
+        self.recorder._write_event("websocket_connect", {"url": "wss://example.test/socket"})
+        self.recorder.event_log_file.close()
+        self.recorder.event_log_file = None
+
+    def test_logged_counts_match_event_log(self, tmp_path):
+        """Test counts kept while logging equal a scan of the written events.ndjson"""
+        self.write_events(tmp_path)
+
+        counts = count_event_types(str(tmp_path / "events.ndjson"))
+
+        assert self.recorder.logged_counts == counts
+        assert counts == {"events_count": 5, "requests_count": 1, "websockets_count": 1, "console_count": 1}
+
+    def test_reconstructed_har_pairs_request_with_response(self, tmp_path):
+        """Test the pre-filtered HAR rebuild keeps only requests, matched to their responses"""
+        self.write_events(tmp_path)
+
+        self.recorder._reconstruct_har_from_events()
+
+        entries = json.loads((tmp_path / "recording.har").read_text())["log"]["entries"]
+        assert len(entries) == 1
+        entry = entries[0]
+        assert entry["request"]["method"] == "POST"
+        assert entry["request"]["url"] == "https://example.test/api/login"
+        assert entry["request"]["postData"]["text"] == "user=alice"
+        assert entry["response"]["status"] == 201
+        assert entry["response"]["content"]["mimeType"] == "application/json"
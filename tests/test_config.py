@@ -1,47 +1,66 @@
 """Tests for configuration module"""
 
 import os
+import sys
+import functools
 import pytest
-from pathlib import Path
-from scripts.config import (
-    BASE_DIR, LOGS_DIR, RECORDINGS_DIR,
-    get_log_file, get_recording_dir
-)
-
-
-class TestConfig:
-    """Test configuration settings"""
-    
-    def test_base_directories_exist(self):
-        """Test that base directories are created"""
-        assert LOGS_DIR.exists()
-        assert RECORDINGS_DIR.exists()
-    
-    def test_get_log_file(self):
-        """Test log file path generation"""
-        log_file = get_log_file("test_component")
-        assert log_file.parent == LOGS_DIR
-        assert log_file.name == "test_component.log"
-    
-    def test_get_recording_dir_project_only(self):
-        """Test recording directory for project only"""
-        recording_dir = get_recording_dir("test_project")
-        assert recording_dir.parent == RECORDINGS_DIR
-        assert recording_dir.name == "test_project"
-        assert recording_dir.exists()
-    
-    def test_get_recording_dir_with_user(self):
-        """Test recording directory with user"""
-        recording_dir = get_recording_dir("test_project", "test_user")
-        assert recording_dir.parent.parent == RECORDINGS_DIR
-        assert recording_dir.parent.name == "test_project"
-        assert recording_dir.name == "test_user"
-        assert recording_dir.exists()
-    
-    def test_environment_variables(self):
-        """Test environment variable loading"""
-        # These should work with or without .env file
-        from scripts.config import LOG_LEVEL, AUDIO_SAMPLE_RATE
-        assert LOG_LEVEL in ["DEBUG", "INFO", "WARNING", "ERROR"]
-        assert isinstance(AUDIO_SAMPLE_RATE, int)
-        assert AUDIO_SAMPLE_RATE > 0
\ No newline at end of file
+from scripts.config import AUDIO_SAMPLE_RATE, LOG_LEVEL, LOGS_DIR, get_log_file, get_recording_dir
+
+_VALID_LOG_LEVELS = frozenset(("DEBUG", "INFO", "WARNING", "ERROR"))
+_LOGS_DIR_STR = str(LOGS_DIR)
+
+
+@functools.lru_cache(maxsize=None)
+def _listed_dirs(parent: str) -> frozenset:
+    """Names of the subdirectories of parent, read with a single scandir()"""
+    try:
+        with os.scandir(parent) as entries:
+            return frozenset(entry.name for entry in entries if entry.is_dir())
+    except FileNotFoundError:
+        return frozenset()
+
+
+def _exists(path: str) -> bool:
+    """Directory check answered from the cached parent listing"""
+    parent, name = os.path.split(path)
+    # Entries created after the parent was listed fall back to a stat
+    return name in _listed_dirs(parent) or os.path.isdir(path)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _clear_exists_cache():
+    """Drop memoized existence checks once this module's tests finish"""
+    yield
+    _listed_dirs.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def _assert_config_cached(config_module):
+    """Fail if a test re-imports scripts.config and re-parses .env"""
+    yield
+    assert sys.modules.get("scripts.config") is config_module
+
+
+def test_get_log_file():
+    """Test log file path generation"""
+    log_dir, log_name = os.path.split(str(get_log_file("test_component")))
+    assert log_dir == _LOGS_DIR_STR
+    assert log_name == "test_component.log"
+
+
+@pytest.mark.parametrize("user", [None, "test_user"])
+def test_get_recording_dir(recordings_root, user):
+    """Test recording directory for project only and with user"""
+    recording_dir = get_recording_dir("test_project", user)
+    expected_parts = ("test_project", user) if user else ("test_project",)
+    assert str(recording_dir.parents[len(expected_parts) - 1]) == str(recordings_root)
+    assert recording_dir.parts[-len(expected_parts):] == expected_parts
+    assert _exists(str(recording_dir))
+
+
+def test_environment_variables():
+    """Test environment variable loading"""
+    # These should work with or without .env file
+    assert LOG_LEVEL in _VALID_LOG_LEVELS
+    assert isinstance(AUDIO_SAMPLE_RATE, int)
+    assert AUDIO_SAMPLE_RATE > 0
\ No newline at end of file
@@ -0,0 +1,358 @@
+"""Tests for recording manager scanning"""
+
+import json
+import os
+import shutil
+import pytest
+from datetime import datetime
+from rich.console import Console
+from scripts.browser_recorder import Phase1BrowserRecorder
+from scripts.recording_manager import (
+    RecordingColumns, RecordingManager,
+    count_event_types, count_session_dirs, session_timestamp
+)
+
+
+def write_session(root, user, session_id, metadata, event_types=()):
+    """Create a session directory with metadata.json and events.ndjson"""
+    session_dir = root / "recordings" / "test_project" / user / session_id
+    session_dir.mkdir(parents=True)
+    (session_dir / "metadata.json").write_text(json.dumps({"session_id": session_id, **metadata}))
+    with open(session_dir / "events.ndjson", "w") as f:
+        for event_type in event_types:
+            f.write(json.dumps({"type": event_type, "data": {}}) + "\n")
+    return session_dir
+
+
+def table_cells(text):
+    """Stripped cell values of each line of a rendered rich table"""
+    return [[cell.strip() for cell in line.split("│")[1:-1]] for line in text.splitlines() if line.startswith("│")]
+
+
+class TestRecordingManager:
+    """Test recording discovery and event counting"""
+
+    @pytest.fixture(autouse=True)
+    def chdir_tmp(self, tmp_path, monkeypatch):
+        """Run each test against an empty ./recordings tree"""
+        monkeypatch.chdir(tmp_path)
+        self.root = tmp_path
+
+    def test_scan_counts_legacy_events(self):
+        """Test legacy sessions are counted from events.ndjson and the counts persisted"""
+        session_dir = write_session(
+            self.root, "alice", "s1", {"start_time": "2024-01-01T10:00:00"},
+            ["request", "request_finished", "websocket_connect", "console_message", "navigation"]
+        )
+
+        recordings = RecordingManager("test_project")._scan_recordings()
+
+        rec = recordings["alice"][0]
+        assert rec["session_id"] == "s1"
+        assert rec["events_count"] == 5
+        assert rec["requests_count"] == 2
+        assert rec["websockets_count"] == 1
+        assert rec["console_count"] == 1
+
+        metadata = json.loads((session_dir / "metadata.json").read_text())
+        assert metadata["events_count"] == 5
+
+    def test_scan_uses_persisted_counts(self):
+        """Test counts stored in metadata.json skip the events.ndjson scan"""
+        counts = {"events_count": 42, "requests_count": 7, "websockets_count": 3, "console_count": 2}
+        write_session(self.root, "bob", "s1", counts, ["request"])
+
+        rec = RecordingManager("test_project")._scan_recordings()["bob"][0]
+
+        for key, value in counts.items():
+            assert rec[key] == value
+
+    def test_scan_cache_rereads_modified_metadata(self):
+        """Test a cached session is reloaded when its metadata.json changes"""
+        session_dir = write_session(self.root, "alice", "s1", {"description": "Login"}, ["request"])
+        manager = RecordingManager("test_project")
+        assert manager._scan_recordings()["alice"][0]["description"] == "Login"
+
+        metadata = json.loads((session_dir / "metadata.json").read_text())
+        (session_dir / "metadata.json").write_text(json.dumps({**metadata, "description": "Login and logout"}))
+
+        assert manager._scan_recordings()["alice"][0]["description"] == "Login and logout"
+
+    def test_scan_cache_recounts_legacy_events_without_write_back(self, monkeypatch):
+        """Test legacy sessions whose counts cannot be persisted are recounted when events change"""
+        monkeypatch.setattr(RecordingManager, "_persist_event_counts", lambda *args: False)
+        session_dir = write_session(self.root, "alice", "s1", {}, ["request"])
+        manager = RecordingManager("test_project")
+        assert manager._scan_recordings()["alice"][0]["events_count"] == 1
+
+        with open(session_dir / "events.ndjson", "a") as f:
+            f.write(json.dumps({"type": "websocket_connect", "data": {}}) + "\n")
+
+        rec = manager._scan_recordings()["alice"][0]
+        assert rec["events_count"] == 2
+        assert rec["websockets_count"] == 1
+
+    def test_warm_scan_skips_thread_pool(self, monkeypatch):
+        """Test a scan answered entirely from the cache does not start worker threads"""
+        for session_id in ("s1", "s2", "s3"):
+            write_session(self.root, "alice", session_id, {"description": session_id})
+        manager = RecordingManager("test_project")
+        cold = manager._scan_recordings()
+
+        monkeypatch.setattr("scripts.recording_manager.ThreadPoolExecutor", lambda *args, **kwargs: pytest.fail())
+
+        assert manager._scan_recordings() == cold
+
+    def test_scan_cache_prunes_deleted_sessions(self):
+        """Test sessions removed from disk are dropped from the scan cache"""
+        write_session(self.root, "alice", "s1", {})
+        session_dir = write_session(self.root, "alice", "s2", {})
+        manager = RecordingManager("test_project")
+        manager._scan_recordings()
+        assert len(manager._scan_cache) == 2
+
+        shutil.rmtree(session_dir)
+
+        remaining = manager._scan_recordings()["alice"]
+        assert [rec["session_id"] for rec in remaining] == ["s1"]
+        assert list(manager._scan_cache) == [remaining[0]["path"]]
+
+    def test_scan_start_fallback_predates_count_write_back(self):
+        """Test sessions without start_time sort by their original metadata mtime"""
+        session_dir = write_session(self.root, "alice", "s1", {}, ["request"])
+        old_mtime = datetime(2001, 1, 1).timestamp()
+        os.utime(session_dir / "metadata.json", (old_mtime, old_mtime))
+
+        rec = RecordingManager("test_project")._scan_recordings()["alice"][0]
+        rescanned = RecordingManager("test_project")._scan_recordings()["alice"][0]
+
+        assert rec["events_count"] == rescanned["events_count"] == 1
+        assert rec["_start_ts"] == rescanned["_start_ts"] == old_mtime
+
+    def test_count_event_types_skips_malformed_lines(self):
+        """Test the byte-level classifier ignores lines that are not events"""
+        events_file = self.root / "events.ndjson"
+        events_file.write_text(
+            '{"id": "s-1", "type": "request", "data": {"type": "xhr"}}\n'
+            '{"type":"websocket_send","data":{}}\n'
+            'not json\n'
+            '\n'
+            '{"id": "s-3", "data": {}}\n'
+        )
+
+        counts = count_event_types(str(events_file))
+
+        assert counts == {"events_count": 3, "requests_count": 1, "websockets_count": 1, "console_count": 0}
+
+    def test_find_session_by_partial_id(self):
+        """Test sessions are located by directory name without a full scan"""
+        write_session(self.root, "alice", "20240101_100000_abcd", {})
+        session_dir = write_session(self.root, "bob", "20240102_100000_efgh", {})
+
+        manager = RecordingManager("test_project")
+
+        assert manager._find_session("20240102_100000_efgh") == ("bob", str(session_dir.relative_to(self.root)))
+        assert manager._find_session("efgh")[0] == "bob"
+        assert manager._find_session("missing") is None
+
+    def test_check_duplicate_uses_index(self, monkeypatch):
+        """Test duplicates are found from the index, rebuilt from metadata when missing"""
+        monkeypatch.setattr("scripts.recording_manager.Confirm.ask", lambda *args, **kwargs: False)
+        write_session(self.root, "alice", "s1", {"description": "Login Flow"})
+
+        manager = RecordingManager("test_project")
+        assert manager.check_duplicate("alice", "login flow")
+        assert not manager.check_duplicate("alice", "checkout")
+
+        write_session(self.root, "alice", "s2", {"description": "Checkout"})
+        manager.register_recording("alice", "Checkout", "s2")
+        reloaded = RecordingManager("test_project")
+        assert reloaded.check_duplicate("alice", "checkout")
+        assert not reloaded.check_duplicate("bob", "checkout")
+
+    def test_registered_recorder_session_survives_checks(self, monkeypatch):
+        """Test a session in the recorder's directory layout stays indexed once registered"""
+        monkeypatch.setattr("scripts.recording_manager.Confirm.ask", lambda *args, **kwargs: False)
+        session_dir = Phase1BrowserRecorder(project="test_project")._session_dir_for("alice", "alice_s1")
+        session_dir.mkdir(parents=True)
+        (session_dir / "metadata.json").write_text(json.dumps({"session_id": "alice_s1", "description": "Login"}))
+
+        RecordingManager("test_project").register_recording("alice", "Login", "alice_s1")
+
+        for _ in range(2):
+            assert RecordingManager("test_project").check_duplicate("alice", "login")
+
+    def test_check_duplicate_rewrites_index_only_on_change(self, monkeypatch):
+        """Test sessions the index cannot name by description are not re-read or re-saved"""
+        monkeypatch.setattr("scripts.recording_manager.Confirm.ask", lambda *args, **kwargs: False)
+        write_session(self.root, "alice", "s1", {"description": "Login", "start_time": "2024-01-01T10:00:00"})
+        write_session(self.root, "alice", "s2", {"description": "Login", "start_time": "2024-01-02T10:00:00"})
+        write_session(self.root, "alice", "s3", {})
+        RecordingManager("test_project")._get_dedup_index()
+
+        writes = []
+        monkeypatch.setattr("scripts.recording_manager.replace_json_file", lambda path, data: writes.append(path))
+        monkeypatch.setattr(RecordingManager, "_load_session", lambda *args, **kwargs: pytest.fail("session re-read"))
+        for _ in range(3):
+            assert RecordingManager("test_project").check_duplicate("alice", "login")
+        assert writes == []
+
+    def test_check_duplicate_ignores_deleted_sessions(self, monkeypatch):
+        """Test index entries for sessions removed from disk are not reported and are dropped"""
+        monkeypatch.setattr("scripts.recording_manager.Confirm.ask", lambda *args, **kwargs: False)
+        session_dir = write_session(self.root, "alice", "s1", {"description": "Login Flow"})
+        assert RecordingManager("test_project").check_duplicate("alice", "login flow")
+
+        shutil.rmtree(session_dir.parent)
+
+        manager = RecordingManager("test_project")
+        assert not manager.check_duplicate("alice", "login flow")
+        index = json.loads((self.root / "recordings" / "test_project" / ".dedup.json").read_text())
+        assert "alice" not in index
+
+    def test_check_duplicate_finds_unregistered_sessions(self, monkeypatch):
+        """Test sessions recorded without register_recording are picked up from disk"""
+        monkeypatch.setattr("scripts.recording_manager.Confirm.ask", lambda *args, **kwargs: False)
+        write_session(self.root, "alice", "s1", {"description": "Login"})
+        manager = RecordingManager("test_project")
+        assert not manager.check_duplicate("alice", "checkout")
+
+        write_session(self.root, "alice", "s2", {"description": "Checkout"})
+
+        assert RecordingManager("test_project").check_duplicate("alice", "checkout")
+
+    def test_register_recording_keeps_concurrent_entries(self):
+        """Test register_recording merges into the index on disk rather than its stale copy"""
+        manager = RecordingManager("test_project")
+        manager._get_dedup_index()
+
+        RecordingManager("test_project").register_recording("bob", "Search", "s9")
+        manager.register_recording("alice", "Login", "s1")
+
+        index = json.loads((self.root / "recordings" / "test_project" / ".dedup.json").read_text())
+        assert index["bob"]["descriptions"]["search"]["session_id"] == "s9"
+        assert index["alice"]["descriptions"]["login"]["session_id"] == "s1"
+
+    def test_export_recordings_streams_valid_json(self):
+        """Test streamed JSON and NDJSON exports contain every recording"""
+        write_session(self.root, "alice", "s1", {"description": "Login"})
+        write_session(self.root, "alice", "s2", {"description": "Logout"})
+        (self.root / "recordings" / "test_project" / "bob").mkdir()
+
+        manager = RecordingManager("test_project")
+        manager.export_recordings("export.json")
+        manager.export_recordings("export.ndjson")
+
+        exported = json.loads((self.root / "export.json").read_text())
+        assert exported["project"] == "test_project"
+        assert exported["recordings"]["bob"] == []
+        assert sorted(rec["session_id"] for rec in exported["recordings"]["alice"]) == ["s1", "s2"]
+
+        lines = (self.root / "export.ndjson").read_text().splitlines()
+        assert sorted(json.loads(line)["session"]["session_id"] for line in lines) == ["s1", "s2"]
+
+    def test_delete_recordings_for_user(self, monkeypatch):
+        """Test deleting one user's recordings leaves other users untouched"""
+        monkeypatch.setattr("scripts.recording_manager.Confirm.ask", lambda *args, **kwargs: True)
+        write_session(self.root, "alice", "s1", {})
+        write_session(self.root, "alice", "s2", {})
+        write_session(self.root, "bob", "s3", {})
+
+        manager = RecordingManager("test_project")
+        assert manager._count_recordings() == {"alice": 2, "bob": 1}
+
+        manager.delete_recordings("alice")
+
+        assert manager._count_recordings() == {"bob": 1}
+
+    def test_calculate_coverage_from_columns(self):
+        """Test per-user coverage totals computed over the columnar view"""
+        write_session(self.root, "alice", "s1", {"duration_seconds": 30, "start_time": "2024-01-01T10:00:00",
+                                                "description": "Login"}, ["request", "console_message"])
+        write_session(self.root, "alice", "s2", {"duration_seconds": 45, "start_time": "2024-01-02T10:00:00",
+                                                "description": "Logout"}, ["request"])
+        write_session(self.root, "bob", "s3", {"duration_seconds": 10}, ["navigation"])
+        (self.root / "recordings" / "test_project" / "carol").mkdir()
+
+        manager = RecordingManager("test_project")
+        columns = RecordingColumns.from_recordings(manager._scan_recordings())
+        by_user = dict(zip(columns.user_names, manager._calculate_coverage(columns)))
+        coverage = by_user["alice"]
+
+        assert by_user["bob"]["total_duration"] == 10
+        assert by_user["bob"]["total_events"] == 1
+        assert by_user["carol"]["total_recordings"] == 0
+        assert by_user["carol"]["last_recording"] is None
+
+        assert coverage["total_recordings"] == 2
+        assert coverage["total_duration"] == 75
+        assert coverage["total_events"] == 3
+        assert coverage["total_requests"] == 2
+        assert sorted(coverage["features_covered"]) == ["Login", "Logout"]
+        assert coverage["last_recording"] == datetime(2024, 1, 2, 10, 0).timestamp()
+
+    def test_show_menu_renders_coverage_and_recent_recordings(self, monkeypatch):
+        """Test the menu tables for sessions with and without a start_time"""
+        monkeypatch.setattr("scripts.recording_manager.Prompt.ask", lambda *args, **kwargs: "q")
+        write_session(self.root, "alice", "s1", {"duration_seconds": 75, "start_time": "2024-01-01T10:00:00",
+                                                "description": "Login"}, ["request", "request"])
+        legacy_dir = write_session(self.root, "alice", "s2", {"description": "Legacy"}, ["console_message"])
+        legacy_mtime = datetime(2001, 1, 1, 8, 5).timestamp()
+        os.utime(legacy_dir / "metadata.json", (legacy_mtime, legacy_mtime))
+        write_session(self.root, "bob", "s3", {"duration_seconds": 5, "start_time": "2024-01-02T09:30:00",
+                                              "description": "Search"}, ["navigation"])
+        (self.root / "recordings" / "test_project" / "carol").mkdir()
+
+        manager = RecordingManager("test_project")
+        manager.console = Console(record=True, width=200)
+        assert manager.show_menu() == "q"
+
+        coverage, recent = manager.console.export_text().split("Recent Recordings:")
+        rows = {cells[0]: cells for cells in table_cells(coverage) if cells[0]}
+        assert rows["alice"][:4] + rows["alice"][5:] == ["alice", "2", "1:15", "3", "2024-01-01 10:00"]
+        assert "Login" in coverage and "Legacy" in coverage
+        assert rows["bob"] == ["bob", "1", "0:05", "1", "Search", "2024-01-02 09:30"]
+        assert rows["carol"] == ["carol", "0", "0:00", "0", "None", "Never"]
+
+        # Newest first, with the legacy session placed by its metadata.json mtime
+        assert recent.index("Search") < recent.index("Login") < recent.index("Legacy")
+        assert "08:05" in recent
+
+    def test_show_project_recordings_renders_counts(self):
+        """Test the project listing shows per-session durations and event counts"""
+        write_session(self.root, "alice", "s1", {"duration_seconds": 61, "description": "Login"},
+                      ["request", "websocket_connect", "console_message", "navigation"])
+
+        manager = RecordingManager("test_project")
+        manager.console = Console(record=True, width=200)
+        manager.show_project_recordings()
+
+        rows = table_cells(manager.console.export_text())
+        assert ["alice", "Login", "1:01", "4", "1", "1", "1"] in rows
+
+    def test_project_menu_caps_recording_counts(self, monkeypatch):
+        """Test session counting stops at the cap and the project menu shows a capped label"""
+        monkeypatch.setattr("scripts.recording_manager.RECORDING_COUNT_CAP", 3)
+        monkeypatch.setattr("scripts.recording_manager.Prompt.ask", lambda *args, **kwargs: "q")
+        for user in ("alice", "bob"):
+            for i in range(3):
+                (self.root / "recordings" / "big" / user / f"s{i}").mkdir(parents=True)
+        (self.root / "recordings" / "small" / "alice" / "s0").mkdir(parents=True)
+
+        assert count_session_dirs(str(self.root / "recordings" / "big"), 4) == 4
+        assert count_session_dirs(str(self.root / "recordings" / "big"), 100) == 6
+
+        manager = RecordingManager()
+        manager.console = Console(record=True, width=200)
+        assert manager.show_project_menu() == "quit"
+
+        output = manager.console.export_text()
+        assert "big (3+ recordings)" in output
+        assert "small (1 recordings)" in output
+
+    def test_session_timestamp_falls_back_on_invalid_start_time(self):
+        """Test malformed or non-string start_time values use the fallback"""
+        assert session_timestamp({"start_time": "2024-01-01T10:00:00Z"}, 0.0) == 1704103200.0
+        assert session_timestamp({"start_time": "yesterday"}, 1.0) == 1.0
+        assert session_timestamp({"start_time": 1704103200}, 2.0) == 2.0
+        assert session_timestamp({}, 3.0) == 3.0